@@ -1,6 +1,38 @@
-"""Public package interface for Brave Search toolkit."""
+"""Public package interface for Brave Search toolkit.
 
-from .brave_client import BraveSearchClient
-from .content_extractor import ContentExtractor
+These re-exports are the canonical import surface; importing the modules
+directly by file path would create duplicate classes (and duplicate
+archive/config singletons), so always import through the package.
 
-__all__ = ["BraveSearchClient", "ContentExtractor"]
+The re-exports resolve lazily (PEP 562), so importing the package stays
+cheap: aiohttp, sqlite3 and the optional compression stack only load when
+the class that needs them is first touched.
+"""
+
+# Attribute name -> submodule that defines it
+_exports = {
+    "ArchiveManager": "archive_manager",
+    "BraveSearchClient": "brave_client",
+    "ContentExtractor": "content_extractor",
+    "ExtractedContent": "content_extractor",
+    "SearchConfig": "config_loader",
+    "SearchResult": "brave_client",
+    "get_config": "config_loader",
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    try:
+        module_name = _exports[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache so later lookups skip this hook
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
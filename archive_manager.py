@@ -1,122 +1,435 @@
 """Simple archive manager for search and extraction data"""
+import hashlib
+import io
 import json
+import os
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 logger = logging.getLogger(__name__)
 
+
+def _url_hash(url: str) -> str:
+    """Short stable hex digest of a URL for filenames and database keys.
+
+    Nothing here needs a cryptographic hash; xxh3 is used when available
+    with stdlib blake2b as the fallback (both far faster than md5).
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(url.encode())
+    return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, preferring orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _append_jsonl(path: Path, lines: List[bytes], compressor=None) -> Path:
+    """Append serialized records to a JSONL file, zstd-compressed per `compressor`.
+
+    A file started under one compression setting stays in that format: when
+    either variant (plain or .zst) already exists, appends go there rather
+    than splitting the day's records across two files. zstd frames can be
+    concatenated, so compressed files remain append-only. Returns the path
+    actually written.
+    """
+    payload = b'\n'.join(lines) + b'\n'
+    zst_path = path.with_name(path.name + '.zst')
+    if path.exists():
+        use_zst = False
+    elif zst_path.exists():
+        use_zst = True
+    else:
+        use_zst = compressor is not None
+
+    if use_zst:
+        if compressor is None:
+            if zstd is None:
+                raise ImportError(f"zstandard is required to append to {zst_path.name}")
+            compressor = zstd.ZstdCompressor(level=3)
+        path = zst_path
+        payload = compressor.compress(payload)
+    with open(path, 'ab') as f:
+        f.write(payload)
+    return path
+
+
+def _iter_jsonl(path: Path):
+    """Yield records from a JSON Lines file, one parsed object per line.
+
+    Reads the plain file and then the .zst variant; both can exist for the
+    same day if the compression setting changed between runs.
+    """
+    zst_path = path.with_name(path.name + '.zst')
+    found = False
+
+    if path.exists():
+        found = True
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield _loads(line)
+
+    if zst_path.exists():
+        found = True
+        if zstd is None:
+            raise ImportError(f"zstandard is required to read {zst_path.name}")
+        with open(zst_path, 'rb') as raw:
+            reader = zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            for line in io.TextIOWrapper(reader, encoding='utf-8'):
+                line = line.strip()
+                if line:
+                    yield _loads(line)
+
+    if not found:
+        # Raise the usual FileNotFoundError for a date with no archive
+        open(path, 'rb').close()
+
+
 class ArchiveManager:
     """Manages archive of search results and extracted content"""
 
-    def __init__(self, archive_dir: str = "./archives"):
+    # Archive directories already created in this process (avoids re-issuing
+    # mkdir syscalls on every instantiation)
+    _dirs_ready: set = set()
+
+    def __init__(self, archive_dir: str = "./archives",
+                 compress: Optional[bool] = None):
         self.archive_dir = Path(archive_dir)
         self.daily_dir = self.archive_dir / 'daily'
         self.extracted_dir = self.archive_dir / 'extracted'
 
-        # Create directories
-        self.archive_dir.mkdir(exist_ok=True)
+        # Explicit persistence format: None means compress when zstandard is
+        # installed, True requires it, False always writes plain JSONL.
+        if compress is None:
+            compress = zstd is not None
+        elif compress and zstd is None:
+            raise ImportError("zstandard is required for compress=True")
+        self.compress = compress
+        # Per-instance compressor: python-zstandard compressor objects are
+        # not thread-safe, and each instance only holds its own write lock
+        self._zstd_compressor = zstd.ZstdCompressor(level=3) if compress else None
+
+        # URL database (SQLite, keyed by url_hash) opened lazily
+        self.url_db_path = self.archive_dir / 'url_database.sqlite'
+        self._url_db_conn: Optional[sqlite3.Connection] = None
+
+        # O(1) membership caches for known titles/queries per url_hash, so
+        # repeat sightings of a URL skip the JSON round-trip and linear scan
+        self._titles_seen: Dict[str, set] = {}
+        self._queries_seen: Dict[str, set] = {}
+
+        # Counters live in the URL database (stats table): several instances
+        # archive into the same directory, and SQLite increments are
+        # transactional where a shared counters file would lose updates
+        self.stats_file = self.archive_dir / 'stats.json'
+
+        # Serializes archive writes when callers run them from worker threads
+        self._lock = threading.Lock()
+
+    _STAT_KEYS = ('total_searches', 'total_results', 'total_extractions')
+
+    def _bump_stats(self, conn: sqlite3.Connection, counts: Dict[str, int]) -> None:
+        """Increment archive counters atomically (caller provides the transaction)."""
+        conn.executemany(
+            'INSERT INTO stats (key, value) VALUES (?, ?)'
+            ' ON CONFLICT(key) DO UPDATE SET value = value + excluded.value',
+            list(counts.items()),
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return archive counters plus the number of distinct URLs seen."""
+        conn = self._url_db()
+        stats = dict.fromkeys(self._STAT_KEYS, 0)
+        stats.update(conn.execute('SELECT key, value FROM stats'))
+        stats['total_urls'] = conn.execute(
+            'SELECT COUNT(*) FROM urls'
+        ).fetchone()[0]
+        return stats
+
+    def _ensure_dirs(self) -> None:
+        """Create archive directories once per process, lazily before first write."""
+        key = str(self.archive_dir)
+        if key in ArchiveManager._dirs_ready:
+            return
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
         self.daily_dir.mkdir(exist_ok=True)
         self.extracted_dir.mkdir(exist_ok=True)
+        ArchiveManager._dirs_ready.add(key)
+
+    def _url_db(self) -> sqlite3.Connection:
+        """Open (once) the SQLite URL database and ensure its schema exists."""
+        if self._url_db_conn is None:
+            self._ensure_dirs()
+            conn = sqlite3.connect(self.url_db_path, check_same_thread=False)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS urls ('
+                ' url_hash TEXT PRIMARY KEY,'
+                ' url TEXT NOT NULL,'
+                ' first_seen TEXT NOT NULL,'
+                ' last_seen TEXT NOT NULL,'
+                ' titles TEXT NOT NULL,'
+                ' queries TEXT NOT NULL,'
+                ' seen_count INTEGER NOT NULL DEFAULT 1'
+                ')'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS stats ('
+                ' key TEXT PRIMARY KEY,'
+                ' value INTEGER NOT NULL'
+                ')'
+            )
+            self._migrate_stats_file(conn)
+            self._url_db_conn = conn
+        return self._url_db_conn
+
+    def _migrate_stats_file(self, conn: sqlite3.Connection) -> None:
+        """One-time import of counters from the legacy stats.json file."""
+        if conn.execute('SELECT COUNT(*) FROM stats').fetchone()[0] > 0:
+            return
+        try:
+            with open(self.stats_file, 'rb') as f:
+                legacy = _loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return
+        with conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO stats (key, value) VALUES (?, ?)',
+                [(key, legacy.get(key, 0)) for key in self._STAT_KEYS],
+            )
+        os.replace(self.stats_file, self.stats_file.with_suffix('.json.bak'))
+
+    def _update_url_database(self, batch: List[tuple], timestamp_iso: str) -> None:
+        """Record each result URL in the URL database (one transaction per batch)."""
+        conn = self._url_db()
+        with conn:
+            for query, results, _search_type in batch:
+                self._record_url_sightings(conn, query, results, timestamp_iso)
+
+    def _record_url_sightings(self, conn: sqlite3.Connection, query: str,
+                              results: List[Any], timestamp_iso: str) -> None:
+        for result in results:
+            url_hash = _url_hash(result.url)
+            titles = self._titles_seen.get(url_hash)
+
+            if titles is None:
+                row = conn.execute(
+                    'SELECT titles, queries FROM urls WHERE url_hash = ?',
+                    (url_hash,),
+                ).fetchone()
+
+                if row is None:
+                    self._titles_seen[url_hash] = {result.title}
+                    self._queries_seen[url_hash] = {query}
+                    conn.execute(
+                        'INSERT INTO urls'
+                        ' (url_hash, url, first_seen, last_seen, titles, queries, seen_count)'
+                        ' VALUES (?, ?, ?, ?, ?, ?, 1)',
+                        (url_hash, result.url, timestamp_iso, timestamp_iso,
+                         _dumps([result.title]).decode('utf-8'),
+                         _dumps([query]).decode('utf-8')),
+                    )
+                    continue
+
+                titles = self._titles_seen[url_hash] = set(_loads(row[0].encode('utf-8')))
+                queries = self._queries_seen[url_hash] = set(_loads(row[1].encode('utf-8')))
+            else:
+                queries = self._queries_seen[url_hash]
+
+            changed = False
+            if result.title not in titles:
+                titles.add(result.title)
+                changed = True
+            if query not in queries:
+                queries.add(query)
+                changed = True
+
+            if changed:
+                conn.execute(
+                    'UPDATE urls SET last_seen = ?, titles = ?, queries = ?,'
+                    ' seen_count = seen_count + 1 WHERE url_hash = ?',
+                    (timestamp_iso,
+                     _dumps(sorted(titles)).decode('utf-8'),
+                     _dumps(sorted(queries)).decode('utf-8'),
+                     url_hash),
+                )
+            else:
+                conn.execute(
+                    'UPDATE urls SET last_seen = ?,'
+                    ' seen_count = seen_count + 1 WHERE url_hash = ?',
+                    (timestamp_iso, url_hash),
+                )
+
+    def get_url_record(self, url: str) -> Optional[dict]:
+        """Look up the sighting record for a URL, or None if never archived."""
+        url_hash = _url_hash(url)
+        row = self._url_db().execute(
+            'SELECT url, first_seen, last_seen, titles, queries, seen_count'
+            ' FROM urls WHERE url_hash = ?',
+            (url_hash,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'url': row[0],
+            'first_seen': row[1],
+            'last_seen': row[2],
+            'titles': _loads(row[3].encode('utf-8')),
+            'queries': _loads(row[4].encode('utf-8')),
+            'seen_count': row[5],
+        }
+
+    def close(self) -> None:
+        """Close the URL database connection if it was opened."""
+        if self._url_db_conn is not None:
+            self._url_db_conn.close()
+            self._url_db_conn = None
 
     def archive_search_results(self, query: str, results: List[Any], search_type: str = 'web') -> Optional[Path]:
-        """Archive search results to daily JSON file"""
+        """Archive search results to daily JSONL file (append-only)"""
+        return self.archive_search_batch([(query, results, search_type)])
+
+    def archive_search_batch(self, batch: List[tuple]) -> Optional[Path]:
+        """Archive several (query, results, search_type) entries in one pass.
+
+        Coalescing a batch means one file open, one write syscall per batch
+        (not per search), and one URL-database transaction.
+        """
+        if not batch:
+            return None
+
+        with self._lock:
+            return self._archive_search_batch_locked(batch)
+
+    def _archive_search_batch_locked(self, batch: List[tuple]) -> Optional[Path]:
+        self._ensure_dirs()
         timestamp = datetime.now()
+        timestamp_iso = timestamp.isoformat()
         date_str = timestamp.strftime('%Y-%m-%d')
 
         # Daily file path
-        daily_file = self.daily_dir / f'{date_str}_searches.json'
-
-        # Load existing or create new
-        if daily_file.exists():
-            with open(daily_file, 'r', encoding='utf-8') as f:
-                daily_data = json.load(f)
-        else:
-            daily_data = {
-                'date': date_str,
-                'searches': []
-            }
-
-        # Create search record
-        search_record = {
-            'query': query,
-            'type': search_type,
-            'timestamp': timestamp.isoformat(),
-            'result_count': len(results),
-            'results': []
-        }
+        daily_file = self.daily_dir / f'{date_str}_searches.jsonl'
 
-        # Add results
-        for result in results:
-            result_data = {
-                'url': result.url,
-                'title': result.title,
-                'snippet': getattr(result, 'snippet', result.description),
-                'age': getattr(result, 'age', None)
+        lines = []
+        total_results = 0
+        for query, results, search_type in batch:
+            search_record = {
+                'query': query,
+                'type': search_type,
+                'timestamp': timestamp_iso,
+                'result_count': len(results),
+                'results': [
+                    {
+                        'url': result.url,
+                        'title': result.title,
+                        'snippet': getattr(result, 'snippet', result.description),
+                        'age': getattr(result, 'age', None)
+                    }
+                    for result in results
+                ]
             }
-            search_record['results'].append(result_data)
+            lines.append(_dumps(search_record))
+            total_results += len(results)
 
-        # Append and save
-        daily_data['searches'].append(search_record)
+        # Append one record per line; no read-back or re-serialization needed
+        daily_file = _append_jsonl(daily_file, lines, self._zstd_compressor)
 
-        with open(daily_file, 'w', encoding='utf-8') as f:
-            json.dump(daily_data, f, ensure_ascii=False, indent=2)
+        try:
+            self._update_url_database(batch, timestamp_iso)
+            conn = self._url_db()
+            with conn:
+                self._bump_stats(conn, {
+                    'total_searches': len(batch),
+                    'total_results': total_results,
+                })
+        except sqlite3.Error as e:
+            logger.error("URL database update failed: %s", e)
 
-        logger.info("Archived %d search results to %s", len(results), daily_file.name)
+        logger.info(
+            "Archived %d search results (%d searches) to %s",
+            total_results, len(batch), daily_file.name,
+        )
 
         return daily_file
 
+    def iter_search_records(self, date_str: str):
+        """Yield archived search records for a given date (YYYY-MM-DD)."""
+        return _iter_jsonl(self.daily_dir / f'{date_str}_searches.jsonl')
+
     def archive_extracted_content(self, contents: List[Any]) -> Optional[Path]:
         """Archive extracted content"""
         if not contents:
             return None
 
+        with self._lock:
+            return self._archive_extracted_content_locked(contents)
+
+    def _archive_extracted_content_locked(self, contents: List[Any]) -> Optional[Path]:
+        self._ensure_dirs()
+        # Format the timestamp once; it is constant for the whole batch
         timestamp = datetime.now()
+        timestamp_iso = timestamp.isoformat()
         date_str = timestamp.strftime('%Y-%m-%d')
 
-        # Daily extractions file
-        daily_file = self.extracted_dir / f'{date_str}_extractions.json'
-
-        # Load existing or create new
-        if daily_file.exists():
-            with open(daily_file, 'r', encoding='utf-8') as f:
-                daily_data = json.load(f)
-        else:
-            daily_data = {
-                'date': date_str,
-                'extractions': []
-            }
+        # Daily extractions file, plus one packed daily file for full texts
+        # (one file per extraction caused heavy inode/fsync churn at volume)
+        daily_file = self.extracted_dir / f'{date_str}_extractions.jsonl'
+        texts_file = self.extracted_dir / f'{date_str}_texts.jsonl'
 
         # Create extraction batch record
         batch_record = {
-            'timestamp': timestamp.isoformat(),
+            'timestamp': timestamp_iso,
             'total': len(contents),
             'successful': [],
             'failed': []
         }
 
         # Process each content
+        text_lines = []
         for content in contents:
             if content.success and content.text:
-                # Save individual full text
-                content_filename = f"{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}_{hash(content.url) % 100000000:08x}.json"
-                content_file = self.extracted_dir / content_filename
-
-                content_data = {
+                url_hash = _url_hash(content.url)
+                text_lines.append(_dumps({
                     'url': content.url,
+                    'url_hash': url_hash,
                     'title': content.title,
                     'text': content.text,
-                    'extraction_time': timestamp.isoformat()
-                }
-
-                with open(content_file, 'w', encoding='utf-8') as f:
-                    json.dump(content_data, f, ensure_ascii=False, indent=2)
+                    'extraction_time': timestamp_iso
+                }))
 
                 batch_record['successful'].append({
                     'url': content.url,
+                    'url_hash': url_hash,
                     'title': content.title,
-                    'file': content_filename,
                     'text_length': len(content.text)
                 })
             else:
@@ -125,11 +438,23 @@ class ArchiveManager:
                     'error': getattr(content, 'error', 'Unknown error')
                 })
 
-        # Append batch record and save
-        daily_data['extractions'].append(batch_record)
+        # Append all full texts with a single write; the actual file name
+        # (plain or .zst) is only known once the append has picked a variant
+        if text_lines:
+            texts_path = _append_jsonl(texts_file, text_lines, self._zstd_compressor)
+            for entry in batch_record['successful']:
+                entry['file'] = texts_path.name
+
+        # Append batch record as one line
+        daily_file = _append_jsonl(daily_file, [_dumps(batch_record)],
+                                   self._zstd_compressor)
 
-        with open(daily_file, 'w', encoding='utf-8') as f:
-            json.dump(daily_data, f, ensure_ascii=False, indent=2)
+        try:
+            conn = self._url_db()
+            with conn:
+                self._bump_stats(conn, {'total_extractions': len(contents)})
+        except sqlite3.Error as e:
+            logger.error("Stats update failed: %s", e)
 
         success_count = len(batch_record['successful'])
         failed_count = len(batch_record['failed'])
@@ -142,3 +467,11 @@ class ArchiveManager:
         )
 
         return daily_file
+
+    def iter_extraction_records(self, date_str: str):
+        """Yield archived extraction batch records for a given date (YYYY-MM-DD)."""
+        return _iter_jsonl(self.extracted_dir / f'{date_str}_extractions.jsonl')
+
+    def iter_extracted_texts(self, date_str: str):
+        """Yield archived full-text records for a given date (YYYY-MM-DD)."""
+        return _iter_jsonl(self.extracted_dir / f'{date_str}_texts.jsonl')
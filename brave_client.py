@@ -1,16 +1,23 @@
 """Brave Search API Client"""
 import aiohttp
 import asyncio
+import concurrent.futures
+import json
 import time
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlparse
 import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .config_loader import get_config
-from .archive_manager import ArchiveManager
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Search result"""
     url: str
@@ -22,21 +29,26 @@ class SearchResult:
     source_type: Optional[str] = None
 
 class RateLimiter:
-    """Rate limiter to control API request frequency"""
+    """Rate limiter to control API request frequency.
+
+    Uses the monotonic clock (immune to wall-clock jumps) and reserves each
+    caller's slot under a lock, so concurrent coroutines cannot race past
+    the limit; the actual sleep happens outside the lock.
+    """
     def __init__(self, requests_per_second: float = 1.0):
         self.min_interval = 1.0 / requests_per_second
-        self.last_request_time = 0
+        self._next_allowed = time.monotonic()
+        self._lock = asyncio.Lock()
 
     async def wait_if_needed(self):
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        async with self._lock:
+            now = time.monotonic()
+            wait_time = max(0.0, self._next_allowed - now)
+            self._next_allowed = max(self._next_allowed, now) + self.min_interval
 
-        if time_since_last < self.min_interval:
-            wait_time = self.min_interval - time_since_last
+        if wait_time > 0:
             await asyncio.sleep(wait_time)
 
-        self.last_request_time = time.time()
-
 class BraveSearchClient:
     """Brave Search API Client"""
 
@@ -52,8 +64,121 @@ class BraveSearchClient:
         self.rate_limiter = RateLimiter(requests_per_second)
 
         self.enable_archive = brave_config.get('enable_archive', True)
-        archive_path = brave_config.get('archive_path', './archives')
-        self.archive_manager = ArchiveManager(archive_path) if self.enable_archive else None
+        if self.enable_archive:
+            # Deferred import: archiving pulls in sqlite3 and the optional
+            # compression stack, which disabled-archive users never need
+            from .archive_manager import ArchiveManager
+            archive_path = brave_config.get('archive_path', './archives')
+            self.archive_manager = ArchiveManager(archive_path)
+        else:
+            self.archive_manager = None
+
+        # Constant per client; set once as session defaults rather than
+        # rebuilt for every request
+        self._headers = {
+            'X-Subscription-Token': self.api_key,
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip'
+        }
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Background archive writer (created lazily inside the running loop)
+        self._archive_queue: Optional[asyncio.Queue] = None
+        self._archive_task: Optional[asyncio.Task] = None
+        self._io_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it lazily.
+
+        Reusing one session keeps TCP connections, TLS sessions and DNS
+        lookups warm across searches instead of paying for them per request.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+
+    async def warmup(self):
+        """Open the HTTP session and pre-resolve the API host.
+
+        Calling this ahead of the first search overlaps session setup and
+        the DNS lookup with whatever else the caller is doing.
+        """
+        self._get_session()
+        host = urlparse(self.base_url).hostname
+        if host:
+            try:
+                await asyncio.get_running_loop().getaddrinfo(host, 443)
+            except OSError:
+                pass  # resolution failures surface on the real request
+
+    def _queue_archive(self, query: str, results: List[SearchResult], search_type: str):
+        """Hand search results to the background archive writer."""
+        if self._archive_queue is None:
+            self._archive_queue = asyncio.Queue(maxsize=256)
+            self._archive_task = asyncio.create_task(self._archive_worker())
+        try:
+            self._archive_queue.put_nowait((query, results, search_type))
+        except asyncio.QueueFull:
+            logger.warning('Archive queue full, dropping record for %r', query)
+
+    # Coalescing window for the archive writer: records arriving within this
+    # time are written together (one file open and one transaction per batch)
+    _ARCHIVE_BATCH_WINDOW = 0.1
+    _ARCHIVE_BATCH_MAX = 64
+
+    async def _archive_worker(self):
+        """Drain the archive queue, writing coalesced batches off the event loop."""
+        queue = self._archive_queue
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(self._ARCHIVE_BATCH_WINDOW)
+            while len(batch) < self._ARCHIVE_BATCH_MAX:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                if self._io_pool is None:
+                    self._io_pool = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=2, thread_name_prefix='archive'
+                    )
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io_pool,
+                    self.archive_manager.archive_search_batch, batch,
+                )
+            except Exception as e:
+                logger.error(f'Archive failed: {e}')
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def aclose(self):
+        """Drain pending archives and close the shared HTTP session."""
+        if self._archive_task is not None:
+            await self._archive_queue.join()
+            self._archive_task.cancel()
+            try:
+                await self._archive_task
+            except asyncio.CancelledError:
+                pass
+            self._archive_task = None
+            self._archive_queue = None
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> 'BraveSearchClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
 
     async def search(self, query: str, **params) -> List[SearchResult]:
         """Search using Brave API (web/search endpoint)."""
@@ -68,48 +193,67 @@ class BraveSearchClient:
         if params:
             search_params.update(params)
 
-        headers = {
-            'X-Subscription-Token': self.api_key,
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip'
-        }
-
         url = f'{self.base_url}/{endpoint_path}'
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=search_params, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
+        session = self._get_session()
+        async with session.get(url, params=search_params) as response:
+            response.raise_for_status()
+            # Read raw bytes and decode with orjson when available; the
+            # stdlib json used by response.json() is noticeably slower
+            raw = await response.read()
 
-        results: List[SearchResult] = []
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
         web_results = data.get('web', {}).get('results', [])
+        news_results = data.get('news', {}).get('results', [])
+
+        # Pre-size the list and bind the constructor locally: avoids list
+        # growth reallocations and a global lookup per item in the hot loop
+        results: List[SearchResult] = [None] * (len(web_results) + len(news_results))
+        make_result = SearchResult
+        i = 0
+
         for item in web_results:
-            results.append(SearchResult(
+            description = item.get('description', '')
+            results[i] = make_result(
                 url=item.get('url', ''),
                 title=item.get('title', ''),
-                description=item.get('description', ''),
-                snippet=item.get('snippet', item.get('description', '')),
+                description=description,
+                snippet=item.get('snippet', description),
                 age=item.get('age'),
                 extra_snippets=item.get('extra_snippets'),
                 source_type='web'
-            ))
+            )
+            i += 1
 
-        news_results = data.get('news', {}).get('results', [])
         for item in news_results:
-            results.append(SearchResult(
+            description = item.get('description', '')
+            results[i] = make_result(
                 url=item.get('url', ''),
                 title=item.get('title', ''),
-                description=item.get('description', ''),
-                snippet=item.get('snippet', item.get('description', '')),
+                description=description,
+                snippet=item.get('snippet', description),
                 age=item.get('age'),
                 source_type='news'
-            ))
+            )
+            i += 1
 
         if self.enable_archive and self.archive_manager and results:
-            try:
-                self.archive_manager.archive_search_results(query, results, 'web')
-            except Exception as e:
-                logger.error(f'Archive failed: {e}')
+            self._queue_archive(query, results, 'web')
 
         return results
+
+    async def search_web_and_news(self, query: str, count: int = 20,
+                                  **params) -> Tuple[List[SearchResult], List[SearchResult]]:
+        """Fetch web and news results with a single API request.
+
+        Brave accepts a comma-joined result_filter, so one request (one
+        rate-limit slot) covers both sections; the parsed results are split
+        by source_type.
+        """
+        params.setdefault('result_filter', 'web,news')
+        results = await self.search(query, count=count, **params)
+
+        web_results = [r for r in results if r.source_type == 'web']
+        news_results = [r for r in results if r.source_type == 'news']
+        return web_results, news_results
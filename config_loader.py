@@ -1,24 +1,46 @@
-import yaml
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_yaml(stream):
+    # Imported lazily so merely importing the package doesn't pay for yaml
+    import yaml
+    try:
+        # libyaml-backed C loader, much faster than the pure-Python one
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    return yaml.load(stream, Loader=Loader)
+
+# Parsed configs keyed by (path, mtime) so re-parsing only happens on change
+_parsed_cache: Dict[Tuple[str, float], Dict[str, Any]] = {}
+
 class SearchConfig:
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
             config_path = Path(__file__).parent / "search_config.yaml"
 
         self.config_path = Path(config_path)
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
-
         self.config = self._load_config()
 
     def _load_config(self) -> Dict[str, Any]:
-        with open(self.config_path, "r") as f:
-            config = yaml.safe_load(f)
+        # EAFP: open directly instead of a separate exists() check
+        try:
+            with open(self.config_path, "rb") as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                cache_key = (str(self.config_path), mtime)
+                cached = _parsed_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                config = _parse_yaml(f) or {}
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}") from None
+
+        _parsed_cache[cache_key] = config
         return config
 
     def get_brave_config(self) -> Dict[str, Any]:
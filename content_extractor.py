@@ -1,13 +1,46 @@
 """Content extractor using Readability with auto-archiving"""
 import aiohttp
 import asyncio
-from typing import Optional, List, Tuple
+import concurrent.futures
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Optional, List, Tuple
 from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
 import logging
 import re
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for the no-lxml text-extraction fallback
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Default request headers, built once and shared (read-only) by every session
+_DEFAULT_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+})
+
+# URL extensions that can never yield article text; skipped without a request
+_SKIP_EXTENSIONS = frozenset({
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico',
+    '.mp3', '.mp4', '.avi', '.mov', '.webm',
+    '.zip', '.gz', '.tar', '.rar', '.7z', '.exe', '.dmg',
+})
+
 @dataclass
 class ExtractedContent:
     url: str
@@ -16,13 +49,69 @@ class ExtractedContent:
     success: bool = False
     error: Optional[str] = None
 
+@dataclass(slots=True)
+class _Job:
+    """Per-URL batch state, parsed once up front."""
+    url: str
+    netloc: str
+    key: str
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter (TCP-style congestion control).
+
+    The window grows by one on each success and shrinks multiplicatively on
+    timeouts or server errors, so batch concurrency tracks what the upstream
+    hosts can actually sustain instead of a fixed guess.
+    """
+
+    def __init__(self, initial: int = 5, min_limit: int = 1, max_limit: int = 20):
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> 'AdaptiveLimiter':
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    async def record_success(self):
+        async with self._cond:
+            if self.limit < self.max_limit:
+                self.limit += 1
+                self._cond.notify_all()
+
+    async def record_failure(self):
+        async with self._cond:
+            self.limit = max(self.min_limit, int(self.limit * 0.7))
+
+
 class ContentExtractor:
     """Content extractor using Readability"""
 
-    def __init__(self, timeout: int = 15, max_text_length: int = 50000, auto_archive: bool = True):
+    # In-flight fetches allowed per host within a batch; keeps a few slow
+    # URLs from one domain from occupying every global slot
+    _PER_HOST_LIMIT = 2
+
+    def __init__(self, timeout: int = 15, max_text_length: int = 50000, auto_archive: bool = True,
+                 max_html_bytes: int = 2_000_000, cache_dir: Optional[str] = None,
+                 cache_ttl: float = 86400, connect_timeout: int = 3):
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
         self.max_text_length = max_text_length
         self.auto_archive = auto_archive
+        self.max_html_bytes = max_html_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl
+        self._memory_cache: dict = {}
 
         try:
             from readability import Document
@@ -30,6 +119,16 @@ class ContentExtractor:
         except ImportError:
             raise ImportError("Please install: pip install readability-lxml")
 
+        # lxml ships with readability-lxml; its C-level parser and text
+        # traversal are far faster than regex stripping on large pages
+        try:
+            from lxml import etree, html as lxml_html
+            self._etree = etree
+            self._lxml_html = lxml_html
+        except ImportError:
+            self._etree = None
+            self._lxml_html = None
+
         if self.auto_archive:
             try:
                 from .archive_manager import ArchiveManager
@@ -40,39 +139,200 @@ class ContentExtractor:
                 self.archive_manager = None
         else:
             self.archive_manager = None
-    
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._parse_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._pending_archives: List[asyncio.Task] = []
+
+    def _get_parse_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Thread pool for readability/lxml parsing, created lazily.
+
+        Running the parse off the event loop lets other coroutines' network
+        I/O proceed while CPU-heavy extraction runs (lxml releases the GIL
+        for much of its work).
+        """
+        if self._parse_pool is None:
+            self._parse_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=os.cpu_count(), thread_name_prefix='parse'
+            )
+        return self._parse_pool
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it lazily.
+
+        One session means pooled connections, keep-alive and a DNS cache
+        shared across every URL in a batch instead of a TCP+TLS handshake
+        per fetch.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=self._PER_HOST_LIMIT,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                ),
+                # Granular limits: a host with a slow handshake fails fast
+                # instead of consuming the whole per-URL budget
+                timeout=aiohttp.ClientTimeout(
+                    total=self.timeout,
+                    connect=self.connect_timeout,
+                    sock_connect=self.connect_timeout,
+                    sock_read=max(5, self.timeout - 5),
+                ),
+                headers=_DEFAULT_HEADERS,
+            )
+        return self._session
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        # blake2b is C-implemented and faster than sha256 for short keys
+        return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[ExtractedContent]:
+        """Look up a previous extraction by key (memory first, then disk)."""
+        cached = self._memory_cache.get(key)
+        if cached is not None:
+            return cached
+        if self.cache_dir is None:
+            return None
+
+        try:
+            with open(self.cache_dir / key[:2] / key, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - data.get('ts', 0) > self.cache_ttl:
+            return None
+
+        content = ExtractedContent(
+            url=data['url'],
+            title=data.get('title'),
+            text=data.get('text'),
+            success=True,
+        )
+        self._memory_cache[key] = content
+        return content
+
+    def _cache_put(self, key: str, content: ExtractedContent) -> None:
+        self._memory_cache[key] = content
+        if self.cache_dir is None:
+            return
+
+        shard = self.cache_dir / key[:2]
+        shard.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'url': content.url,
+            'title': content.title,
+            'text': content.text,
+            'ts': time.time(),
+        }
+        with open(shard / key, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(payload))
+            else:
+                f.write(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+    async def _archive_async(self, results: List['ExtractedContent']):
+        """Write an archive batch in the default executor, logging failures."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.archive_manager.archive_extracted_content, results
+            )
+        except Exception as e:
+            logger.error(f"Failed to archive extracted content: {e}")
+
+    async def close(self):
+        """Flush pending archives, then close the session and parse pool."""
+        if self._pending_archives:
+            await asyncio.gather(*self._pending_archives, return_exceptions=True)
+            self._pending_archives.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+
+    async def __aenter__(self) -> 'ContentExtractor':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
     async def _fetch_html(self, url: str) -> Tuple[Optional[str], str]:
         """Fetch HTML from URL"""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept-Language': 'en-US,en;q=0.9'
-        }
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if ext in _SKIP_EXTENSIONS:
+            return None, f"skip {ext}"
 
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, headers=headers, allow_redirects=True) as response:
-                    if response.status >= 400:
-                        return None, f"HTTP {response.status}"
+            session = self._get_session()
+            async with session.get(url, allow_redirects=True) as response:
+                if response.status >= 400:
+                    return None, f"HTTP {response.status}"
+
+                # Non-HTML bodies (PDFs, images, video) would only waste
+                # bandwidth and fail in the parser; skip before reading
+                ctype = response.headers.get('Content-Type', '').lower()
+                if ctype and 'html' not in ctype and 'xml' not in ctype:
+                    return None, f"skip {ctype.split(';')[0]}"
+
+                # Short-circuit pages we would truncate anyway
+                length = response.content_length
+                if length is not None and length > self.max_html_bytes:
+                    return None, f"Too large ({length} bytes)"
 
-                    html = await response.text()
-                    return html, ""
+                # Bounded read: caps memory per URL and avoids the eager
+                # whole-body decode (with chardet fallback) of .text()
+                raw = await response.content.read(self.max_html_bytes)
+                encoding = response.charset or 'utf-8'
+                try:
+                    html = raw.decode(encoding, errors='replace')
+                except LookupError:
+                    html = raw.decode('utf-8', errors='replace')
+                return html, ""
 
         except asyncio.TimeoutError:
             return None, "Timeout"
         except Exception as e:
             return None, str(e)[:100]
 
+    def _tree_to_text(self, tree) -> str:
+        """Collect visible text from an lxml element (C-level traversal).
+
+        Everything that can never contribute visible text — including
+        comments — is dropped in one pass before the text walk, so those
+        subtrees are never touched again.
+        """
+        self._etree.strip_elements(
+            tree, 'script', 'style', 'noscript', 'iframe', 'svg',
+            self._etree.Comment, with_tail=False,
+        )
+        return '\n'.join(s.strip() for s in tree.itertext() if s.strip())
+
     def _extract_text(self, html: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract text from HTML using Readability"""
         try:
             doc = self.Document(html)
+            # Title must be read before summary(): summary replaces the
+            # document's internal tree with the cleaned article element
             title = doc.title()
             summary_html = doc.summary()
 
-            # Simple regex-based text extraction
-            text = re.sub(r'<[^>]+>', ' ', summary_html)
-            text = re.sub(r'\s+', ' ', text).strip()
+            if self._etree is not None:
+                # After summary(), readability leaves the cleaned article as
+                # its internal lxml element; walking it directly skips a full
+                # re-parse of the serialized summary string
+                tree = getattr(doc, 'html', None)
+                if not self._etree.iselement(tree):
+                    tree = self._lxml_html.fromstring(summary_html)
+                text = self._tree_to_text(tree)
+            else:
+                # Regex fallback when lxml is unavailable
+                text = _TAG_RE.sub(' ', summary_html)
+                text = _WS_RE.sub(' ', text).strip()
 
             return title, text
 
@@ -80,8 +340,14 @@ class ContentExtractor:
             logger.error(f"Extraction failed: {e}")
             return None, None
 
-    async def extract(self, url: str) -> ExtractedContent:
+    async def extract(self, url: str, cache_key: Optional[str] = None) -> ExtractedContent:
         """Extract content from URL"""
+        if cache_key is None:
+            cache_key = self._cache_key(url)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         result = ExtractedContent(url=url)
 
         html, error = await self._fetch_html(url)
@@ -90,49 +356,105 @@ class ContentExtractor:
             result.success = False
             return result
 
-        title, text = self._extract_text(html)
+        title, text = await asyncio.get_running_loop().run_in_executor(
+            self._get_parse_pool(), self._extract_text, html
+        )
 
         if text:
             result.title = title
             result.text = text[:self.max_text_length]
             result.success = True
+            self._cache_put(cache_key, result)
         else:
             result.error = "Failed to extract content"
             result.success = False
 
         return result
     
-    async def extract_batch(self, urls: List[str], max_concurrent: int = 5) -> List[ExtractedContent]:
-        """Extract content from multiple URLs with auto-archiving"""
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def extract_with_limit(url: str) -> ExtractedContent:
-            async with semaphore:
-                return await self.extract(url)
-
-        tasks = [extract_with_limit(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        final_results = []
-        for url, result in zip(urls, results):
-            if isinstance(result, Exception):
-                final_results.append(ExtractedContent(
-                    url=url,
-                    success=False,
-                    error=str(result)[:100]
-                ))
-            else:
-                final_results.append(result)
+    @staticmethod
+    def _is_backoff_error(result: ExtractedContent) -> bool:
+        """True for failures that signal upstream overload (timeout / 5xx)."""
+        error = result.error or ''
+        return error.startswith('Timeout') or error.startswith('HTTP 5')
+
+    async def extract_stream(self, urls: List[str],
+                             max_concurrent: int = 5) -> AsyncIterator[ExtractedContent]:
+        """Yield extracted contents as they complete (not in input order).
+
+        Fast URLs are available to the consumer immediately instead of
+        waiting behind the slowest fetch in the batch. Completed results
+        are auto-archived when the stream finishes (or is abandoned).
+        """
+        limiter = AdaptiveLimiter(initial=max_concurrent, max_limit=max_concurrent * 4)
+        host_sems = defaultdict(lambda: asyncio.Semaphore(self._PER_HOST_LIMIT))
 
-        if self.auto_archive and self.archive_manager:
+        # Parse and hash each URL exactly once for the whole batch
+        jobs = [_Job(url=url, netloc=urlparse(url).netloc, key=self._cache_key(url))
+                for url in urls]
+
+        async def extract_with_limit(job: _Job) -> ExtractedContent:
             try:
-                self.archive_manager.archive_extracted_content(final_results)
+                # Per-host cap first: same-host overflow waits here without
+                # holding a global slot that a fast host could be using
+                async with host_sems[job.netloc], limiter:
+                    result = await self.extract(job.url, cache_key=job.key)
             except Exception as e:
-                logger.error(f"Failed to archive extracted content: {e}")
+                result = ExtractedContent(url=job.url, success=False, error=str(e)[:100])
+            if self._is_backoff_error(result):
+                await limiter.record_failure()
+            else:
+                await limiter.record_success()
+            return result
+
+        tasks: List[asyncio.Task] = []
+        completed: List[ExtractedContent] = []
 
-        success_count = sum(1 for r in final_results if r.success)
-        total = len(final_results)
-        if total > 0:
-            logger.info(f"Extraction: {success_count}/{total} successful ({success_count*100/total:.1f}%)")
+        async def drain() -> AsyncIterator[ExtractedContent]:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+
+        try:
+            if hasattr(asyncio, 'TaskGroup'):
+                # Structured concurrency (3.11+): abandoning the stream
+                # cancels the whole group promptly on the way out
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        tasks.extend(tg.create_task(extract_with_limit(job)) for job in jobs)
+                        async for result in drain():
+                            completed.append(result)
+                            yield result
+                except BaseExceptionGroup as eg:
+                    # aclose() injects GeneratorExit at the yield and the
+                    # group wraps it; unwrap so generator shutdown stays clean
+                    if eg.split(GeneratorExit)[1] is None:
+                        raise GeneratorExit from None
+                    raise
+            else:
+                tasks.extend(asyncio.ensure_future(extract_with_limit(job)) for job in jobs)
+                async for result in drain():
+                    completed.append(result)
+                    yield result
+        finally:
+            # No-op on normal exhaustion; stops workers if the consumer quit
+            for task in tasks:
+                task.cancel()
+
+            if self.auto_archive and self.archive_manager and completed:
+                # Fire-and-forget: disk I/O overlaps whatever the caller
+                # does next; close() awaits anything still in flight
+                self._pending_archives = [t for t in self._pending_archives if not t.done()]
+                self._pending_archives.append(
+                    asyncio.create_task(self._archive_async(list(completed)))
+                )
+
+            success_count = sum(1 for r in completed if r.success)
+            total = len(completed)
+            if total > 0:
+                logger.info(f"Extraction: {success_count}/{total} successful ({success_count*100/total:.1f}%)")
+
+    async def extract_batch(self, urls: List[str], max_concurrent: int = 5) -> List[ExtractedContent]:
+        """Extract content from multiple URLs with auto-archiving.
 
-        return final_results
+        List form of extract_stream; results arrive in completion order.
+        """
+        return [content async for content in self.extract_stream(urls, max_concurrent)]
@@ -1,33 +1,37 @@
 #!/usr/bin/env python3
 """Search and extraction demo"""
+import argparse
 import asyncio
-import sys
-from datetime import datetime
 import logging
+import time
 from .brave_client import BraveSearchClient
 from .content_extractor import ContentExtractor
 
 DEMO_KEYWORD = "bitcoin whale"
 EXTRACT_TOP_N = 10
 
-async def demo_search(keyword):
+async def demo_search(keyword, count=10, top_n=EXTRACT_TOP_N):
     """Demo search and extraction workflow"""
     logger = logging.getLogger("demo")
     logger.info("Searching for: %r", keyword)
 
-    # Initialize clients
-    client = BraveSearchClient()
-    extractor = ContentExtractor(auto_archive=True)
+    # Search (the context manager drains background archives on exit)
+    async with BraveSearchClient() as client:
+        # Warm the session/DNS while the extractor initializes; the
+        # constructor runs in a thread so the two genuinely overlap
+        _, extractor = await asyncio.gather(
+            client.warmup(),
+            asyncio.to_thread(ContentExtractor, auto_archive=True),
+        )
 
-    # Search
-    try:
-        search_start = datetime.now()
-        results = await client.search(keyword)
-        search_time = (datetime.now() - search_start).total_seconds()
-        logger.info("Found %d results in %.2fs", len(results), search_time)
-    except Exception as e:
-        logging.exception("Search failed: %s", e)
-        return
+        try:
+            search_start = time.perf_counter()
+            results = await client.search(keyword, count=count)
+            search_time = time.perf_counter() - search_start
+            logger.info("Found %d results in %.2fs", len(results), search_time)
+        except Exception as e:
+            logging.exception("Search failed: %s", e)
+            return
 
     # Display results
     if results:
@@ -38,13 +42,22 @@ async def demo_search(keyword):
 
     # Extract content
     if results:
-        logger.info("Extracting content from top %d URLs...", EXTRACT_TOP_N)
-        urls = [r.url for r in results[:EXTRACT_TOP_N]]
+        logger.info("Extracting content from top %d URLs...", top_n)
+        urls = [r.url for r in results[:top_n]]
 
         try:
-            extract_start = datetime.now()
-            contents = await extractor.extract_batch(urls)
-            extract_time = (datetime.now() - extract_start).total_seconds()
+            extract_start = time.perf_counter()
+            contents = []
+            async with extractor:
+                async for content in extractor.extract_stream(urls):
+                    contents.append(content)
+                    logger.info(
+                        "  [%d/%d] %s %s",
+                        len(contents), len(urls),
+                        "ok  " if content.success else "fail",
+                        content.url[:60],
+                    )
+            extract_time = time.perf_counter() - extract_start
 
             success_count = sum(1 for c in contents if c.success)
             total_chars = sum(len(c.text) for c in contents if c.success and c.text)
@@ -67,10 +80,23 @@ async def demo_search(keyword):
 
     logger.info("Data saved to archives/ directory")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search and extraction demo")
+    parser.add_argument("keyword", nargs="?", default=DEMO_KEYWORD,
+                        help=f"search keyword (default: {DEMO_KEYWORD!r})")
+    parser.add_argument("--count", type=int, default=10,
+                        help="search results to request (default: 10)")
+    parser.add_argument("--top-n", type=int, default=EXTRACT_TOP_N,
+                        help=f"URLs to extract (default: {EXTRACT_TOP_N})")
+    parser.add_argument("--verbose", action="store_true",
+                        help="enable debug logging")
+    return parser.parse_args(argv)
+
 async def main():
     """Main function"""
-    keyword = sys.argv[1] if len(sys.argv) > 1 else DEMO_KEYWORD
-    await demo_search(keyword)
+    args = parse_args()
+    logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    await demo_search(args.keyword, count=args.count, top_n=args.top_n)
 
 if __name__ == "__main__":
     logging.basicConfig(